@@ -7,37 +7,45 @@ Usage:
     python3 analyze_filetype.py perfstats.json "L10" --pattern
 """
 
-import json
 import sys
 import argparse
+from itertools import compress
+from math import sqrt
+from operator import mul
 
+from perfstats import load_perfstats
 
-def load_perfstats(filename):
-    """Load perfstats JSON file."""
-    with open(filename) as f:
-        return json.load(f)
 
-
-def filter_photos(detailed, pattern, use_pattern=False):
-    """Filter photos by extension or pattern."""
+def filter_photos(columns, pattern, use_pattern=False):
+    """Filter photo columns by extension or pattern."""
     if use_pattern:
-        return [p for p in detailed if pattern in p['FilePath']]
+        mask = [pattern in path for path in columns['FilePath']]
     else:
-        # Treat as file extension
-        ext = pattern if pattern.startswith('.') else f'.{pattern}'
-        return [p for p in detailed if p['FilePath'].upper().endswith(ext.upper())]
+        # Treat as file extension; upper-case only the path suffix, not the whole path
+        ext = (pattern if pattern.startswith('.') else f'.{pattern}').upper()
+        start = -len(ext)
+        mask = [path[start:].upper() == ext for path in columns['FilePath']]
+    return {field: tuple(compress(values, mask)) for field, values in columns.items()}
+
 
+def coefficient_of_variation(values, total=None):
+    """Calculate coefficient of variation (CV %).
 
-def coefficient_of_variation(values):
-    """Calculate coefficient of variation (CV %)."""
+    Pass the column's already-computed sum as total to skip re-summing it.
+    """
     if not values or len(values) < 2:
         return 0
-    mean = sum(values) / len(values)
-    if mean == 0:
+    n = len(values)
+    if total is None:
+        total = sum(values)
+    if total == 0:
         return 0
-    variance = sum((v - mean) ** 2 for v in values) / len(values)
-    std_dev = variance ** 0.5
-    return (std_dev / mean) * 100
+    # Timings are integer nanoseconds, so n*sum(x^2) - sum(x)^2 is evaluated
+    # exactly and cannot cancel catastrophically; both reductions stay in C,
+    # unlike a per-element Welford update. Clamp in case of float input.
+    total_sq = sum(map(mul, values, values))
+    std_dev = sqrt(max(n * total_sq - total * total, 0)) / n
+    return (std_dev / (total / n)) * 100
 
 
 def get_percentile(sorted_values, percentile):
@@ -48,29 +56,34 @@ def get_percentile(sorted_values, percentile):
     return sorted_values[min(idx, len(sorted_values) - 1)]
 
 
-def analyze_photos(photos, label):
-    """Analyze a set of photos."""
-    if not photos:
+def get_percentiles(values, percentiles):
+    """Get several percentile values from an unsorted sequence with one sort."""
+    sorted_values = sorted(values)
+    return [get_percentile(sorted_values, pct) for pct in percentiles]
+
+
+def analyze_photos(columns, label):
+    """Analyze a set of photos given as per-field columns."""
+    n = len(columns['FilePath'])
+    if not n:
         print(f"No photos found matching pattern!")
         return
 
-    n = len(photos)
-
     print(f"{label.upper()} ANALYSIS ({n} photos)")
     print("=" * 70)
     print()
 
     # Calculate totals
-    total_time = sum(p['TotalTime'] for p in photos)
-    hash_time = sum(p['HashTime'] for p in photos)
-    metadata_time = sum(p['MetadataTime'] for p in photos)
-    decode_time = sum(p['ImageDecodeTime'] for p in photos)
-    thumbnail_time = sum(p['ThumbnailTime'] for p in photos)
-    color_time = sum(p['ColorTime'] for p in photos)
-    phash_time = sum(p['PerceptualHashTime'] for p in photos)
-    inference_time = sum(p['InferenceTime'] for p in photos)
-    db_time = sum(p['DatabaseTime'] for p in photos)
-    total_bytes = sum(p['FileSize'] for p in photos)
+    total_time = sum(columns['TotalTime'])
+    hash_time = sum(columns['HashTime'])
+    metadata_time = sum(columns['MetadataTime'])
+    decode_time = sum(columns['ImageDecodeTime'])
+    thumbnail_time = sum(columns['ThumbnailTime'])
+    color_time = sum(columns['ColorTime'])
+    phash_time = sum(columns['PerceptualHashTime'])
+    inference_time = sum(columns['InferenceTime'])
+    db_time = sum(columns['DatabaseTime'])
+    total_bytes = sum(columns['FileSize'])
 
     # Calculate averages (convert nanoseconds to milliseconds)
     avg_total = total_time / n / 1_000_000
@@ -104,9 +117,9 @@ def analyze_photos(photos, label):
 
     print(f"{'Stage':<18} {'Time (ms)':>12} {'% of Total':>12}")
     print("-" * 70)
+    pct_scale = 100 / avg_total if avg_total > 0 else 0
     for name, time_ms in stages:
-        pct = (time_ms / avg_total) * 100 if avg_total > 0 else 0
-        print(f"{name:<18} {time_ms:>11.2f}ms {pct:>11.2f}%")
+        print(f"{name:<18} {time_ms:>11.2f}ms {time_ms * pct_scale:>11.2f}%")
 
     print(f"{'TOTAL':<18} {avg_total:>11.2f}ms {'100.00%':>12}")
     print()
@@ -114,30 +127,31 @@ def analyze_photos(photos, label):
     print("DISTRIBUTION STATS:")
     print("-" * 70)
 
-    # Get sorted values for percentiles
-    decode_times = sorted([p['ImageDecodeTime']/1_000_000 for p in photos])
-    thumb_times = sorted([p['ThumbnailTime']/1_000_000 for p in photos])
-    color_times = sorted([p['ColorTime']/1_000_000 for p in photos])
-    total_times = sorted([p['TotalTime']/1_000_000 for p in photos])
+    distribution = [
+        ('Image Decode', 'ImageDecodeTime'),
+        ('Thumbnails', 'ThumbnailTime'),
+        ('Color Extract', 'ColorTime'),
+        ('TOTAL', 'TotalTime'),
+    ]
 
     print(f"{'Stage':<18} {'Min':>10} {'Median':>10} {'P95':>10} {'Max':>10}")
     print("-" * 70)
-    print(f"{'Image Decode':<18} {decode_times[0]:>9.0f}ms {get_percentile(decode_times, 0.5):>9.0f}ms {get_percentile(decode_times, 0.95):>9.0f}ms {decode_times[-1]:>9.0f}ms")
-    print(f"{'Thumbnails':<18} {thumb_times[0]:>9.0f}ms {get_percentile(thumb_times, 0.5):>9.0f}ms {get_percentile(thumb_times, 0.95):>9.0f}ms {thumb_times[-1]:>9.0f}ms")
-    print(f"{'Color Extract':<18} {color_times[0]:>9.0f}ms {get_percentile(color_times, 0.5):>9.0f}ms {get_percentile(color_times, 0.95):>9.0f}ms {color_times[-1]:>9.0f}ms")
-    print(f"{'TOTAL':<18} {total_times[0]:>9.0f}ms {get_percentile(total_times, 0.5):>9.0f}ms {get_percentile(total_times, 0.95):>9.0f}ms {total_times[-1]:>9.0f}ms")
+    for name, field in distribution:
+        # Sort the integer column once; only the selected values are scaled to ms
+        lo, median, p95, hi = (t / 1_000_000 for t in get_percentiles(columns[field], (0, 0.5, 0.95, 1.0)))
+        print(f"{name:<18} {lo:>9.0f}ms {median:>9.0f}ms {p95:>9.0f}ms {hi:>9.0f}ms")
     print()
 
     print("VARIABILITY (Coefficient of Variation %):")
     print("-" * 70)
     variability = [
-        ('Hash', coefficient_of_variation([p['HashTime'] for p in photos])),
-        ('Metadata', coefficient_of_variation([p['MetadataTime'] for p in photos])),
-        ('Image Decode', coefficient_of_variation([p['ImageDecodeTime'] for p in photos])),
-        ('Thumbnails', coefficient_of_variation([p['ThumbnailTime'] for p in photos])),
-        ('Color Extract', coefficient_of_variation([p['ColorTime'] for p in photos])),
-        ('Perceptual Hash', coefficient_of_variation([p['PerceptualHashTime'] for p in photos])),
-        ('Database', coefficient_of_variation([p['DatabaseTime'] for p in photos])),
+        ('Hash', coefficient_of_variation(columns['HashTime'], hash_time)),
+        ('Metadata', coefficient_of_variation(columns['MetadataTime'], metadata_time)),
+        ('Image Decode', coefficient_of_variation(columns['ImageDecodeTime'], decode_time)),
+        ('Thumbnails', coefficient_of_variation(columns['ThumbnailTime'], thumbnail_time)),
+        ('Color Extract', coefficient_of_variation(columns['ColorTime'], color_time)),
+        ('Perceptual Hash', coefficient_of_variation(columns['PerceptualHashTime'], phash_time)),
+        ('Database', coefficient_of_variation(columns['DatabaseTime'], db_time)),
     ]
 
     for name, cv in sorted(variability, key=lambda x: x[1], reverse=True):
@@ -168,7 +182,7 @@ Examples:
     args = parser.parse_args()
 
     data = load_perfstats(args.perfstats_file)
-    photos = filter_photos(data['detailed'], args.pattern, args.pattern)
+    photos = filter_photos(data['columns'], args.pattern, args.pattern)
 
     label = f"{args.pattern} files" if args.pattern else f"{args.pattern} pattern"
     analyze_photos(photos, label)
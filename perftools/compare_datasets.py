@@ -6,20 +6,17 @@ Usage:
     python3 compare_datasets.py perfstats_small.json perfstats_large.json
 """
 
-import json
 import sys
 
-
-def load_perfstats(filename):
-    """Load perfstats JSON file."""
-    with open(filename) as f:
-        return json.load(f)
+from perfstats import load_perfstats
 
 
 def compare_summaries(small, large):
     """Compare summary statistics between two datasets."""
     small_summary = small['summary']
     large_summary = large['summary']
+    small_total = small_summary['AvgTotalMs']
+    large_total = large_summary['AvgTotalMs']
 
     print("PERFORMANCE COMPARISON: Small vs Large Dataset")
     print("=" * 70)
@@ -42,12 +39,13 @@ def compare_summaries(small, large):
         ('Inference', 'AvgInferenceMs'),
         ('Database', 'AvgDatabaseMs'),
     ]
+    timings = [(name, small_summary[key], large_summary[key]) for name, key in stages]
 
     print(f"{'Stage':<18} {'Small %':>10} {'Large %':>10} {'Δ':>10}")
     print("-" * 70)
-    for name, key in stages:
-        small_pct = (small_summary[key] / small_summary['AvgTotalMs']) * 100
-        large_pct = (large_summary[key] / large_summary['AvgTotalMs']) * 100
+    for name, small_ms, large_ms in timings:
+        small_pct = (small_ms / small_total) * 100
+        large_pct = (large_ms / large_total) * 100
         delta = large_pct - small_pct
         print(f"{name:<18} {small_pct:>9.2f}% {large_pct:>9.2f}% {delta:>+9.2f}%")
 
@@ -56,9 +54,7 @@ def compare_summaries(small, large):
     print("-" * 70)
     print(f"{'Stage':<18} {'Small':>10} {'Large':>10} {'Δ':>10} {'% Change':>10}")
     print("-" * 70)
-    for name, key in stages:
-        small_ms = small_summary[key]
-        large_ms = large_summary[key]
+    for name, small_ms, large_ms in timings:
         delta = large_ms - small_ms
         if small_ms > 0:
             pct_change = ((large_ms / small_ms) - 1) * 100
@@ -67,8 +63,6 @@ def compare_summaries(small, large):
         print(f"{name:<18} {small_ms:>9.2f}ms {large_ms:>9.2f}ms {delta:>+9.2f}ms {pct_change:>+9.1f}%")
 
     print()
-    small_total = small_summary['AvgTotalMs']
-    large_total = large_summary['AvgTotalMs']
     delta = large_total - small_total
     pct_change = ((large_total / small_total) - 1) * 100
     print(f"Total per photo:   {small_total:>9.2f}ms {large_total:>9.2f}ms {delta:>+9.2f}ms {pct_change:>+9.1f}%")
@@ -82,8 +76,8 @@ def main():
     small_file = sys.argv[1]
     large_file = sys.argv[2]
 
-    small = load_perfstats(small_file)
-    large = load_perfstats(large_file)
+    small = load_perfstats(small_file, with_columns=False)
+    large = load_perfstats(large_file, with_columns=False)
 
     compare_summaries(small, large)
 
@@ -0,0 +1,187 @@
+"""
+Shared loader for perfstats JSON files.
+
+The first load of a perfstats file parses the JSON once and writes a
+columnar cache next to it (perfstats.json.cache). Later loads read the
+cache instead of re-parsing, as long as it was built from a source file
+with the same size and modification time.
+
+The cache is data only, never unpickled: a JSON header line (format
+version, source identity, row count and summary), then the FilePath
+column as NUL-separated UTF-8, then each numeric column as raw int64
+values. Tools that only need the summary read just the header line.
+
+Set PERFTOOLS_NO_CACHE=1 to neither read nor write the cache, e.g. for
+read-only data directories or CI.
+"""
+
+import json
+import os
+import sys
+from array import array
+from operator import itemgetter
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# Numeric fields of each entry in the perfstats 'detailed' list
+NUMERIC_FIELDS = (
+    'TotalTime',
+    'HashTime',
+    'MetadataTime',
+    'ImageDecodeTime',
+    'ThumbnailTime',
+    'ColorTime',
+    'PerceptualHashTime',
+    'InferenceTime',
+    'DatabaseTime',
+    'FileSize',
+)
+
+COLUMN_FIELDS = ('FilePath',) + NUMERIC_FIELDS
+
+CACHE_SUFFIX = '.cache'
+CACHE_VERSION = 2
+
+# Environment variable that disables the cache when set to a non-empty value
+NO_CACHE_ENV = 'PERFTOOLS_NO_CACHE'
+
+
+def parse_perfstats(filename):
+    """Parse perfstats JSON file, using orjson when it is installed."""
+    with open(filename, 'rb') as f:
+        if orjson is not None:
+            return orjson.loads(f.read())
+        return json.load(f)
+
+
+def to_columns(detailed):
+    """Project a list of photo dicts into one tuple per field."""
+    if not detailed:
+        return {field: () for field in COLUMN_FIELDS}
+    rows = map(itemgetter(*COLUMN_FIELDS), detailed)
+    return dict(zip(COLUMN_FIELDS, zip(*rows)))
+
+
+def source_identity(filename):
+    """Return the (size, mtime_ns) pair a cache must match to be used."""
+    st = os.stat(filename)
+    return [st.st_size, st.st_mtime_ns]
+
+
+def read_header(f, source):
+    """Read and validate a cache header, returning None if it does not apply."""
+    header = json.loads(f.readline())
+    if not isinstance(header, dict):
+        return None
+    if (header.get('version') != CACHE_VERSION
+            or header.get('source') != source
+            or header.get('byteorder') != sys.byteorder
+            or not isinstance(header.get('summary'), dict)):
+        return None
+    rows, paths_bytes = header.get('rows'), header.get('paths_bytes')
+    if type(rows) is not int or type(paths_bytes) is not int or rows < 0 or paths_bytes < 0:
+        return None
+    return header
+
+
+def read_columns(f, header):
+    """Read the columns following a validated header, or None if truncated."""
+    rows = header['rows']
+    paths = f.read(header['paths_bytes'])
+    if len(paths) != header['paths_bytes']:
+        return None
+    file_paths = tuple(paths.decode('utf-8', 'surrogatepass').split('\0')) if rows else ()
+    if len(file_paths) != rows:
+        return None
+    columns = {'FilePath': file_paths}
+    for field in NUMERIC_FIELDS:
+        values = array('q')
+        values.frombytes(f.read(rows * values.itemsize))
+        if len(values) != rows:
+            return None
+        columns[field] = tuple(values)
+    if f.read(1):
+        return None
+    return columns
+
+
+def read_cache(cache_file, source, with_columns):
+    """Read a columnar cache, returning None if it is missing, stale or malformed."""
+    try:
+        with open(cache_file, 'rb') as f:
+            header = read_header(f, source)
+            if header is None:
+                return None
+            data = {'summary': header['summary']}
+            if with_columns:
+                data['columns'] = read_columns(f, header)
+                if data['columns'] is None:
+                    return None
+            return data
+    except (OSError, ValueError):
+        # ValueError covers invalid JSON and UTF-8 in a corrupt cache
+        return None
+
+
+def write_cache(cache_file, source, data):
+    """Write a columnar cache atomically; failures only cost the speedup."""
+    columns = data['columns']
+    try:
+        numeric = [array('q', columns[field]) for field in NUMERIC_FIELDS]
+        paths = '\0'.join(columns['FilePath']).encode('utf-8', 'surrogatepass')
+    except (TypeError, OverflowError):
+        # Non-integer or out-of-range values cannot be stored as int64
+        return
+    header = {
+        'version': CACHE_VERSION,
+        'source': source,
+        'byteorder': sys.byteorder,
+        'rows': len(columns['FilePath']),
+        'paths_bytes': len(paths),
+        'summary': data['summary'],
+    }
+    tmp_file = f'{cache_file}.{os.getpid()}.tmp'
+    try:
+        with open(tmp_file, 'wb') as f:
+            f.write(json.dumps(header).encode() + b'\n')
+            f.write(paths)
+            for values in numeric:
+                values.tofile(f)
+        os.replace(tmp_file, cache_file)
+    except OSError:
+        try:
+            os.remove(tmp_file)
+        except OSError:
+            pass
+
+
+def load_perfstats(filename, with_columns=True):
+    """Load perfstats as {'summary': {...}, 'columns': {field: tuple}}.
+
+    Set with_columns=False when only the summary is needed. Such a load
+    uses the cache if one exists but never builds it.
+    """
+    use_cache = not os.environ.get(NO_CACHE_ENV)
+    cache_file = filename + CACHE_SUFFIX
+    source = source_identity(filename)
+    if use_cache:
+        data = read_cache(cache_file, source, with_columns)
+        if data is not None:
+            return data
+
+    raw = parse_perfstats(filename)
+    if not with_columns:
+        # Building columns would only pay for a cache this caller does not
+        # need; the first with_columns=True load writes it instead
+        return {'summary': raw['summary']}
+    data = {
+        'summary': raw['summary'],
+        'columns': to_columns(raw.get('detailed') or []),
+    }
+    if use_cache:
+        write_cache(cache_file, source, data)
+    return data
@@ -116,9 +116,9 @@ Total per photo:  1166.92ms   767.16ms  -399.76ms     -34.3%
 ```
 
 **Implementation Details**:
-- Single Python file, ~90 lines
-- Uses only `json` and `sys` standard library modules
-- Loads both JSON files into memory
+- Single Python file, ~90 lines, plus the shared `perfstats.py` loader
+- Uses only standard library modules (parses with `orjson` when installed)
+- Loads only the summary of each file, from the columnar cache when it matches the file
 - Calculates deltas and percentage changes
 - Formats output with aligned columns
 
@@ -210,13 +210,14 @@ Metadata               5.8% CV
 ```
 
 **Implementation Details**:
-- Single Python file, ~180 lines
-- Uses only `json`, `sys`, `argparse` standard library modules
-- Filters photos by extension or pattern
+- Single Python file, ~190 lines, plus the shared `perfstats.py` loader
+- Uses only standard library modules (parses with `orjson` when installed)
+- Works on the per-field columns from `perfstats.py`, one tuple per field of the `detailed` list
+- Filters photos by extension or pattern with a boolean mask over `FilePath`
 - Calculates comprehensive statistics:
   - Arithmetic mean for averages
-  - Coefficient of variation (CV) for variability: `(std_dev / mean) * 100`
-  - Percentiles via sorted list indexing
+  - Coefficient of variation (CV) for variability: `(std_dev / mean) * 100`, from the exact integer sum and sum of squares
+  - Percentiles via one sort of each raw nanosecond column (nearest-rank indexing); only the selected values are converted to milliseconds
 - Sorts variability by CV descending to highlight inconsistent stages
 
 **Statistical Definitions**:
@@ -258,8 +259,14 @@ python3 perftools/analyze_filetype.py perfstats_*.json "canon_r5" --pattern
 | compare_datasets.py | 1,189 photos | ~15 MB | <500ms | Fast |
 | analyze_filetype.py | 1,189 photos | ~15 MB | <500ms | Fast |
 
+**Columnar Cache**:
+- `perfstats.py` parses a perfstats file once and writes `<file>.cache` next to it
+- The cache is data only: a JSON header line (format version, source size and mtime, row count, summary), the `FilePath` column as NUL-separated UTF-8, then each numeric column as raw int64 values
+- Later runs read the cache only when the source size and mtime match the header exactly; a stale, malformed or unwritable cache falls back to parsing the JSON
+- `compare_datasets.py` reads only the summary from the cache; without a cache it parses the JSON and neither builds columns nor writes a cache
+
 **Memory Considerations**:
-- Both tools load entire JSON into memory
+- Both tools parse the entire JSON into memory when no fresh cache exists
 - For JSON files >100MB, consider pre-filtering with `jq`:
   ```bash
   jq '.detailed | map(select(.FilePath | contains("L10")))' large.json > filtered.json
@@ -606,6 +613,7 @@ sudo powermetrics --samplers cpu_power -i 1000 -n 1
 ### Code Locations
 
 - **Analysis tools**: `perftools/compare_datasets.py`, `perftools/analyze_filetype.py`
+- **Shared loader and cache**: `perftools/perfstats.py`
 - **Tool documentation**: `perftools/README.md`
 - **Tool specification**: `docs/perftools.spec` (this file)
 - **Performance data generator**: `internal/indexer/indexer.go`, `internal/indexer/perfoutput.go`
@@ -618,10 +626,11 @@ sudo powermetrics --samplers cpu_power -i 1000 -n 1
    - No `pip install` required
    - Works in CI/CD without setup
 
-2. **Single-File Tools**: Each tool is a single Python file
+2. **One File per Tool, Shared Loader**: Each tool is a single Python file; loading perfstats files is shared via `perftools/perfstats.py`
    - Easy to understand and modify
-   - Can be run directly with `python3`
-   - Self-contained logic
+   - Can be run directly with `python3 perftools/<tool>.py`
+   - Tools import `perfstats` as a sibling module, so they must be run from (or copied together with) the `perftools/` directory
+   - Analysis logic stays in the tool; only parsing and caching live in `perfstats.py`
 
 3. **Human-Friendly Output**: Aligned columns, clear labels, visual separators
    - Can be read directly by developers
@@ -638,6 +647,11 @@ sudo powermetrics --samplers cpu_power -i 1000 -n 1
    - Invalid JSON: exit with error
    - No matching photos: print warning and exit
 
+6. **Best-Effort Cache**: Loading a perfstats file with per-photo columns writes `<file>.cache` next to it
+   - This is the only side effect of running a tool; the JSON itself is never modified
+   - Cache problems (stale, malformed, unwritable) are never errors: the tool silently parses the JSON instead
+   - Set `PERFTOOLS_NO_CACHE=1` to neither read nor write the cache (read-only data directories, CI)
+
 ## Future Enhancements
 
 ### Planned